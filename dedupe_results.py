@@ -1,23 +1,58 @@
 import argparse
+import concurrent.futures
 import csv
 import glob
+import hashlib
 import json
 import os
 import re
 import sys
-from typing import Dict, Iterable, List, Tuple
+from typing import Dict, Iterable, List, Optional, Tuple
 
 try:
-    from bs4 import BeautifulSoup  # type: ignore
+    from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer  # type: ignore
     HAS_BS4 = True
 except Exception:
     HAS_BS4 = False
 
+try:
+    from selectolax.lexbor import LexborHTMLParser  # type: ignore
+    HAS_SELECTOLAX = True
+except Exception:
+    HAS_SELECTOLAX = False
+
+try:
+    import xxhash  # type: ignore
+    HAS_XXHASH = True
+except Exception:
+    HAS_XXHASH = False
+
+try:
+    import pandas as pd  # type: ignore
+    HAS_PANDAS = True
+except Exception:
+    HAS_PANDAS = False
+
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+FIELDS = ["reviewer", "date", "link", "text"]
+
+_DIV_TAG_RE = re.compile(r"<(/?)div\b([^>]*)>", re.IGNORECASE)
+_CLASS_ATTR_RE = re.compile(r"""(?:^|\s)class\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s"'>]+))""", re.IGNORECASE)
+_WHITESPACE_RE = re.compile(r"\s*")
+_CARD_CLASS_RE = re.compile(r"(?:^|\s)card(?:\s|$)")
+_SUMMARY_RE = re.compile(r"(<strong>Total reviews scraped:</strong>\s*)\d+")
+
 
 def _normalize_whitespace(text: str) -> str:
     if text is None:
         return ""
-    return re.sub(r"\s+", " ", text.strip()).lower()
+    # str.split() with no separator collapses whitespace runs in C, no regex needed
+    return " ".join(text.split()).lower()
 
 
 def _canonical_link(link: str) -> str:
@@ -27,15 +62,20 @@ def _canonical_link(link: str) -> str:
     return link.split("?")[0].strip()
 
 
-def _review_key(reviewer: str, date: str, link: str, text: str) -> Tuple[str, str, str, str]:
-    # Use a robust key that survives missing links: prefer link, but also include
-    # reviewer/date/text so repeating content with different page URLs is caught.
-    return (
+def _review_digest(reviewer: str, date: str, link: str, text: str) -> bytes:
+    # Robust to missing links: the link is compared alongside reviewer/date/text,
+    # so repeating content with different page URLs is caught. Folded into a
+    # fixed 16-byte digest so the seen-set doesn't hold on to normalized copies.
+    h = xxhash.xxh3_128() if HAS_XXHASH else hashlib.blake2b(digest_size=16)
+    for part in (
         _normalize_whitespace(reviewer),
-        (_normalize_whitespace(date)),
+        _normalize_whitespace(date),
         _canonical_link(link),
         _normalize_whitespace(text),
-    )
+    ):
+        h.update(part.encode("utf-8"))
+        h.update(b"\x1f")
+    return h.digest()
 
 
 def _dedupe_records(records: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
@@ -46,7 +86,7 @@ def _dedupe_records(records: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
         date = r.get("date", "")
         link = r.get("link", "")
         text = r.get("text", "")
-        key = _review_key(reviewer, date, link, text)
+        key = _review_digest(reviewer, date, link, text)
         if key in seen:
             continue
         seen.add(key)
@@ -54,37 +94,81 @@ def _dedupe_records(records: Iterable[Dict[str, str]]) -> List[Dict[str, str]]:
     return unique
 
 
+def _duplicate_mask(df: "pd.DataFrame") -> "pd.Series":
+    # Vectorized equivalent of _review_digest over whole columns, so the
+    # hashing and duplicate detection run inside pandas instead of a per-row loop.
+    keys = pd.DataFrame(index=df.index)
+    for col in FIELDS:
+        values = df[col] if col in df.columns else pd.Series("", index=df.index)
+        values = values.fillna("").astype(str)
+        if col == "link":
+            keys[col] = values.str.split("?", n=1).str[0].str.strip()
+        else:
+            keys[col] = values.str.split().str.join(" ").str.lower()
+    return keys.duplicated(keep="first")
+
+
 def dedupe_csv(path: str, backup: bool = True) -> Tuple[int, int]:
     if not os.path.exists(path):
         return (0, 0)
-    with open(path, "r", encoding="utf-8") as f:
-        reader = csv.DictReader(f)
-        rows = list(reader)
-    before = len(rows)
-    rows = _dedupe_records(rows)
-    after = len(rows)
+    # Stream rows straight into a sibling temp file, then swap it in, so the
+    # file is never held in memory as a whole
+    tmp_path = path + ".tmp"
+    seen = set()
+    before = after = 0
+    try:
+        with open(path, "r", encoding="utf-8") as src, open(
+            tmp_path, "w", newline="", encoding="utf-8"
+        ) as dst:
+            reader = csv.DictReader(src)
+            # Plain csv.writer on tuples skips DictWriter's per-row field lookup
+            writer = csv.writer(dst)
+            writer.writerow(FIELDS)
+            for r in reader:
+                before += 1
+                row = (r.get("reviewer", ""), r.get("date", ""), r.get("link", ""), r.get("text", ""))
+                key = _review_digest(*row)
+                if key in seen:
+                    continue
+                seen.add(key)
+                writer.writerow(row)
+                after += 1
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
     if backup:
         _write_backup(path)
-    with open(path, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["reviewer", "date", "link", "text"])
-        writer.writeheader()
-        writer.writerows(rows)
+    os.replace(tmp_path, path)
     return before, after
 
 
 def dedupe_json(path: str, backup: bool = True) -> Tuple[int, int]:
     if not os.path.exists(path):
         return (0, 0)
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
+    if HAS_ORJSON:
+        with open(path, "rb") as f:
+            data = orjson.loads(f.read())
+    else:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
     reviews = list(data.get("reviews", []))
     before = len(reviews)
-    reviews = _dedupe_records(reviews)
+    if HAS_PANDAS and reviews:
+        # Keep the original dicts; pandas is only used to find the duplicates
+        dupes = _duplicate_mask(pd.DataFrame.from_records(reviews)).tolist()
+        reviews = [r for r, dup in zip(reviews, dupes) if not dup]
+    else:
+        reviews = _dedupe_records(reviews)
     after = len(reviews)
     if backup:
         _write_backup(path)
-    with open(path, "w", encoding="utf-8") as f:
-        json.dump({"reviews": reviews}, f, indent=2, ensure_ascii=False)
+    if HAS_ORJSON:
+        with open(path, "wb") as f:
+            f.write(orjson.dumps({"reviews": reviews}, option=orjson.OPT_INDENT_2))
+    else:
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"reviews": reviews}, f, indent=2, ensure_ascii=False)
     return before, after
 
 
@@ -94,64 +178,147 @@ def dedupe_html(path: str, backup: bool = True) -> Tuple[int, int]:
     with open(path, "r", encoding="utf-8") as f:
         html = f.read()
 
-    if not HAS_BS4:
+    if HAS_SELECTOLAX:
+        before, dupes = _duplicate_cards_selectolax(html)
+    elif HAS_BS4:
+        before, dupes = _duplicate_cards_bs4(html)
+    else:
         print(
-            "[warn] beautifulsoup4 not installed; HTML dedupe will be skipped for",
+            "[warn] neither selectolax nor beautifulsoup4 installed; HTML dedupe will be skipped for",
             os.path.basename(path),
         )
         return (0, 0)
+    if before == 0:
+        return (0, 0)
+    after = before - len(dupes)
+
+    # Cut the duplicate cards out of the raw document so everything else stays
+    # byte-for-byte. The raw offsets are only trusted when they line up with the
+    # parser's cards; otherwise the whole tree is re-serialized.
+    spans = _card_spans(html)
+    if len(spans) == before:
+        out = _remove_spans(html, [spans[i] for i in dupes])
+    else:
+        out = _reserialize_without(html, dupes)
+
+    # Update summary count if present
+    out = _SUMMARY_RE.sub(rf"\g<1>{after}", out, count=1)
+
+    if backup:
+        _write_backup(path)
+    with open(path, "w", encoding="utf-8") as f:
+        f.write(out)
+
+    return before, after
+
+
+def _card_spans(html: str) -> List[Tuple[int, int]]:
+    # (start, end) offsets of every div whose class list includes "card", in
+    # document order, found by pairing up raw <div>/</div> tags
+    stack: List[Optional[int]] = []
+    spans: List[Tuple[int, int]] = []
+    for m in _DIV_TAG_RE.finditer(html):
+        if m.group(1):
+            if stack:
+                start = stack.pop()
+                if start is not None:
+                    spans.append((start, m.end()))
+            continue
+        cls = _CLASS_ATTR_RE.search(m.group(2))
+        classes = (cls.group(1) or cls.group(2) or cls.group(3) or "") if cls else ""
+        stack.append(m.start() if "card" in classes.split() else None)
+    spans.sort()
+    return spans
+
+
+def _remove_spans(html: str, spans: List[Tuple[int, int]]) -> str:
+    parts: List[str] = []
+    pos = 0
+    for start, end in spans:
+        if start < pos:
+            continue  # nested inside a card that's already removed
+        parts.append(html[pos:start])
+        # Drop the whitespace that followed the card too, so no blank lines are left
+        pos = _WHITESPACE_RE.match(html, end).end()
+    parts.append(html[pos:])
+    return "".join(parts)
+
+
+def _reserialize_without(html: str, dupes: List[int]) -> str:
+    drop = set(dupes)
+    if HAS_BS4:
+        soup = _parse_html(html)
+        for i, card in enumerate(soup.find_all("div", class_="card")):
+            if i in drop:
+                card.decompose()
+        return str(soup)
+    tree = LexborHTMLParser(html)
+    for i, card in enumerate(tree.css("div.card")):
+        if i in drop:
+            card.decompose()
+    return tree.html or ""
+
+
+def _duplicate_cards_selectolax(html: str) -> Tuple[int, List[int]]:
+    # lexbor is much faster than bs4 for this flat card layout
+    cards = LexborHTMLParser(html).css("div.card")
+    seen = set()
+    dupes: List[int] = []
+    for i, card in enumerate(cards):
+        reviewer_el = card.css_first(".reviewer")
+        date_el = card.css_first(".date")
+        link_el = card.css_first(".link a")
+        text_el = card.css_first(".text")
+
+        reviewer = reviewer_el.text(strip=True) if reviewer_el else ""
+        date = date_el.text(strip=True) if date_el else ""
+        link = (link_el.attributes.get("href") or "") if link_el else ""
+        text = text_el.text(separator="\n", strip=True) if text_el else ""
+
+        key = _review_digest(reviewer, date, link, text)
+        if key in seen:
+            dupes.append(i)
+            continue
+        seen.add(key)
+    return len(cards), dupes
+
 
-    soup = BeautifulSoup(html, "html.parser")
-    cards = soup.select("div.card")
-    before = len(cards)
+def _duplicate_cards_bs4(html: str) -> Tuple[int, List[int]]:
+    # Only the cards are needed for dedupe; everything around them is kept verbatim.
+    # The strainer sees the raw class string, so "card hl" needs the regex to match.
+    soup = _parse_html(html, parse_only=SoupStrainer("div", class_=_CARD_CLASS_RE))
+    cards = soup.find_all("div", class_="card")
 
+    # Duplicates are reported by position rather than decompose()-d here, which
+    # rewires the tree on every call and goes quadratic on large files
     seen = set()
-    removed = 0
-    for card in list(cards):
-        reviewer_el = card.select_one(".reviewer")
-        date_el = card.select_one(".date")
-        link_el = card.select_one(".link a")
-        text_el = card.select_one(".text")
+    dupes: List[int] = []
+    for i, card in enumerate(cards):
+        reviewer_el = card.find(class_="reviewer")
+        date_el = card.find(class_="date")
+        link_container = card.find(class_="link")
+        link_el = link_container.find("a") if link_container else None
+        text_el = card.find(class_="text")
 
         reviewer = reviewer_el.get_text(strip=True) if reviewer_el else ""
         date = date_el.get_text(strip=True) if date_el else ""
         link = link_el.get("href", "") if link_el else ""
         text = text_el.get_text("\n", strip=True) if text_el else ""
 
-        key = _review_key(reviewer, date, link, text)
+        key = _review_digest(reviewer, date, link, text)
         if key in seen:
-            card.decompose()
-            removed += 1
-        else:
-            seen.add(key)
+            dupes.append(i)
+            continue
+        seen.add(key)
+    return len(cards), dupes
 
-    after = before - removed
 
-    # Update summary count if present
-    summary = soup.select_one(".summary")
-    if summary is not None:
-        # Replace the number after 'Total reviews scraped:' with the new count
-        for node in summary.contents:
-            if isinstance(node, str) and "Total reviews scraped:" in node:
-                # not typical; usually wrapped in <strong>. Keep generic approach below
-                pass
-        # More robust: find the <strong> label then the following text node with a number
-        # but simpler is to regex against the HTML string for that block.
-        summary_html = str(summary)
-        summary_html = re.sub(
-            r"(<strong>Total reviews scraped:</strong>\s*)\d+",
-            rf"\g<1>{after}",
-            summary_html,
-        )
-        new_summary = BeautifulSoup(summary_html, "html.parser")
-        summary.replace_with(new_summary)
-
-    if backup:
-        _write_backup(path)
-    with open(path, "w", encoding="utf-8") as f:
-        f.write(str(soup))
-
-    return before, after
+def _parse_html(html: str, parse_only: "SoupStrainer | None" = None) -> "BeautifulSoup":
+    # lxml is several times faster than the pure-Python parser; fall back if missing
+    try:
+        return BeautifulSoup(html, "lxml", parse_only=parse_only)
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser", parse_only=parse_only)
 
 
 def _write_backup(path: str) -> None:
@@ -168,6 +335,18 @@ def _collect_targets(patterns: List[str]) -> List[str]:
     return files
 
 
+def _dispatch(path: str, backup: bool) -> Optional[Tuple[int, int]]:
+    # Runs in a worker process; returns None for unsupported file types
+    ext = os.path.splitext(path)[1].lower()
+    if ext == ".csv":
+        return dedupe_csv(path, backup=backup)
+    if ext == ".json":
+        return dedupe_json(path, backup=backup)
+    if ext == ".html":
+        return dedupe_html(path, backup=backup)
+    return None
+
+
 def main() -> int:
     parser = argparse.ArgumentParser(
         description="Deduplicate Trustpilot scan outputs (CSV, JSON, HTML)."
@@ -199,28 +378,29 @@ def main() -> int:
             ]
         )
 
+    # A path listed twice would have two workers racing on the same .tmp file
+    targets = list(dict.fromkeys(targets))
+
     if not targets:
         print("No files found to process.")
         return 0
 
     total_removed = 0
-    for path in targets:
-        ext = os.path.splitext(path)[1].lower()
-        try:
-            if ext == ".csv":
-                before, after = dedupe_csv(path, backup=backup)
-            elif ext == ".json":
-                before, after = dedupe_json(path, backup=backup)
-            elif ext == ".html":
-                before, after = dedupe_html(path, backup=backup)
-            else:
-                print(f"[skip] Unsupported file type: {path}")
-                continue
-            removed = max(0, before - after)
-            total_removed += removed
-            print(f"[ok] {os.path.basename(path)}: {before} -> {after} (removed {removed})")
-        except Exception as e:
-            print(f"[error] Failed to process {path}: {e}")
+    # Files are independent and mostly CPU-bound (parsing), so spread them across cores
+    with concurrent.futures.ProcessPoolExecutor() as ex:
+        futures = {path: ex.submit(_dispatch, path, backup) for path in targets}
+        for path, future in futures.items():
+            try:
+                result = future.result()
+                if result is None:
+                    print(f"[skip] Unsupported file type: {path}")
+                    continue
+                before, after = result
+                removed = max(0, before - after)
+                total_removed += removed
+                print(f"[ok] {os.path.basename(path)}: {before} -> {after} (removed {removed})")
+            except Exception as e:
+                print(f"[error] Failed to process {path}: {e}")
 
     if total_removed == 0:
         print("No duplicates found.")
@@ -2,23 +2,41 @@ import os
 import re
 import json
 import shutil
+import hashlib
+import functools
+from collections import OrderedDict
 from datetime import datetime
 from pathlib import Path
 from typing import List, Dict, Any, Tuple
 
 import orjson
+import jinja2
 import subprocess
 import pandas as pd
 import numpy as np
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, FeatureNotFound, SoupStrainer
 from fastapi import FastAPI, Request, UploadFile, Form, File
 from fastapi.responses import HTMLResponse, RedirectResponse, FileResponse, StreamingResponse, JSONResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from sentence_transformers import SentenceTransformer, util
+from sentence_transformers import SentenceTransformer
 import torch
 import threading
 
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_SELECTOLAX = True
+except Exception:
+    HAS_SELECTOLAX = False
+
+try:
+    from optimum.onnxruntime import ORTModelForFeatureExtraction, ORTQuantizer
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+    from transformers import AutoTokenizer
+    HAS_ONNX = True
+except Exception:
+    HAS_ONNX = False
+
 
 # Paths
 # APP_DIR = .../sortingapp/app
@@ -29,17 +47,78 @@ PROJECT_DIR = APP_DIR.parent
 DATA_DIR = PROJECT_DIR.parent
 TEMPLATES_DIR = APP_DIR / "templates"
 STATIC_DIR = APP_DIR / "static"
+# Per-file review embeddings, reused while the source file is unchanged
+EMBED_CACHE_DIR = APP_DIR / "cache"
+EMBED_CACHE_MAX_FILES = 64
+# Prefix of the one-off copies /search makes of uploaded files
+UPLOAD_PREFIX = "_uploaded_"
+# int8-quantized ONNX exports of the sentence-transformer models
+ONNX_DIR = APP_DIR / "onnx"
 
 
 app = FastAPI(title="Review Sorting App")
 app.mount("/static", StaticFiles(directory=str(STATIC_DIR)), name="static")
 templates = Jinja2Templates(directory=str(TEMPLATES_DIR))
 
+UNSAFE_QUERY_RE = re.compile(r"[^a-zA-Z0-9_\-]+")
+# SoupStrainer sees the raw class string at parse time, so "card hl" needs a regex
+CARD_CLASS_RE = re.compile(r"(?:^|\s)card(?:\s|$)")
+
+# Standalone results.html bundled into /export downloads; compiled once at import.
+# Autoescaped, since reviewer names and review text are scraped user content.
+EXPORT_HTML_TEMPLATE = jinja2.Environment(autoescape=True).from_string("""
+        <html>
+        <head>
+            <meta charset='utf-8'>
+            <title>Exported Results</title>
+            <style>
+                body { font-family: Arial, sans-serif; background: #f7fafc; padding: 20px; }
+                h1 { text-align: center; color: #2d3748; }
+                .summary { max-width: 1000px; margin: 0 auto 20px; background: #edf2f7; padding: 15px; border-radius: 8px; }
+                .card { background: #fff; border: 1px solid #e2e8f0; border-radius: 8px; padding: 15px; margin: 15px auto; max-width: 1000px; box-shadow: 0 2px 5px rgba(0,0,0,0.05); }
+                .reviewer { font-weight: bold; color: #2d3748; }
+                .date { color: #718096; font-size: 0.9em; margin-bottom: 4px; }
+                .score { color: #805ad5; font-size: 0.9em; margin-bottom: 8px; }
+                .link a { color: #3182ce; text-decoration: none; }
+                .text { margin-top: 8px; line-height: 1.5; color: #1a202c; white-space: pre-wrap; }
+            </style>
+        </head>
+        <body>
+            <h1>Exported Results</h1>
+            <div class='summary'>
+                <strong>Source:</strong> {{ source }}<br>
+                <strong>Query:</strong> {{ query }}<br>
+                <strong>Threshold:</strong> {{ threshold }}<br>
+                <strong>Total:</strong> {{ total }}
+            </div>
+            {% for r in rows %}
+            <div class='card'>
+                <div class='reviewer'>{{ r.reviewer }}</div>
+                <div class='date'>{{ r.date }}</div>
+                <div class='score'>Match score: {{ '%.3f' | format(r.score or 0) }}</div>
+                <div class='link'><a href='{{ r.link }}' target='_blank'>{{ r.link }}</a></div>
+                <div class='text'>{{ r.text }}</div>
+            </div>
+            {% endfor %}
+        </body>
+        </html>
+        """)
+
 # --- Scraper process state ---
 SCRAPE_PROC = None
 SCRAPE_LOCK = threading.Lock()
 SCRAPE_PAUSED = False
 
+# --- Last searches, so /export can reuse them instead of re-encoding ---
+SEARCH_CACHE: "OrderedDict[str, pd.DataFrame]" = OrderedDict()
+SEARCH_CACHE_SIZE = 16
+
+
+def search_token(src: Path, query: str, model_type: str, threshold: float, sort_by: str) -> str:
+    """Identify a search by its inputs, including the source file's mtime"""
+    key = f"{src.resolve()}|{src.stat().st_mtime_ns}|{query}|{model_type}|{threshold}|{sort_by}"
+    return hashlib.blake2s(key.encode("utf-8")).hexdigest()
+
 
 def list_result_files() -> List[Path]:
     patterns = ["europcar_reviews_*.csv", "europcar_reviews_*.json", "europcar_reviews_*.html"]
@@ -49,69 +128,165 @@ def list_result_files() -> List[Path]:
     return files
 
 
+def parse_html(html: str, parse_only: SoupStrainer | None = None) -> BeautifulSoup:
+    # Prefer the much faster lxml parser, fall back to the stdlib one if it's missing
+    try:
+        return BeautifulSoup(html, "lxml", parse_only=parse_only)
+    except FeatureNotFound:
+        return BeautifulSoup(html, "html.parser", parse_only=parse_only)
+
+
+def parse_review_cards(html: str) -> List[Dict[str, str]]:
+    """Extract reviewer/date/link/text from each div.card of a results page"""
+    rows = []
+    if HAS_SELECTOLAX:
+        # lexbor is far faster than bs4 for this flat card layout
+        for c in LexborHTMLParser(html).css("div.card"):
+            reviewer = c.css_first(".reviewer")
+            date = c.css_first(".date")
+            link = c.css_first(".link a")
+            text = c.css_first(".text")
+            rows.append({
+                "reviewer": reviewer.text(strip=True) if reviewer else "",
+                "date": date.text(strip=True) if date else "",
+                "link": link.attributes.get("href") if link else "",
+                "text": text.text(separator="\n", strip=True) if text else "",
+            })
+        return rows
+
+    # Build a partial tree holding only the review cards
+    soup = parse_html(html, parse_only=SoupStrainer("div", class_=CARD_CLASS_RE))
+    for c in soup.find_all("div", class_="card"):
+        reviewer = c.find(class_="reviewer")
+        date = c.find(class_="date")
+        link_container = c.find(class_="link")
+        link = link_container.find("a") if link_container else None
+        text = c.find(class_="text")
+        rows.append({
+            "reviewer": reviewer.get_text(strip=True) if reviewer else "",
+            "date": date.get_text(strip=True) if date else "",
+            "link": link.get("href") if link else "",
+            "text": text.get_text("\n", strip=True) if text else "",
+        })
+    return rows
+
+
 def read_reviews(path: Path) -> pd.DataFrame:
     if path.suffix.lower() == ".csv":
         df = pd.read_csv(path)
     elif path.suffix.lower() == ".json":
-        with open(path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        df = pd.DataFrame(data.get("reviews", []))
+        data = orjson.loads(path.read_bytes())
+        # Explicit columns skip dtype/column inference and guarantee the shape
+        df = pd.DataFrame.from_records(data.get("reviews", []), columns=["reviewer", "date", "link", "text"])
     elif path.suffix.lower() == ".html":
         with open(path, "r", encoding="utf-8") as f:
-            soup = BeautifulSoup(f.read(), "html.parser")
-        cards = soup.select("div.card")
-        rows = []
-        for c in cards:
-            reviewer = c.select_one(".reviewer")
-            date = c.select_one(".date")
-            link = c.select_one(".link a")
-            text = c.select_one(".text")
-            rows.append({
-                "reviewer": reviewer.get_text(strip=True) if reviewer else "",
-                "date": date.get_text(strip=True) if date else "",
-                "link": link.get("href") if link else "",
-                "text": text.get_text("\n", strip=True) if text else "",
-            })
-        df = pd.DataFrame(rows)
+            df = pd.DataFrame(parse_review_cards(f.read()))
     else:
         raise ValueError("Unsupported file type")
 
-    # Normalize columns
+    # Normalize columns (CSV/HTML sources may be missing some)
     for col in ["reviewer", "date", "link", "text"]:
         if col not in df.columns:
             df[col] = ""
-    # Coerce date
-    with np.errstate(all="ignore"):
-        df["date"] = pd.to_datetime(df["date"], errors="coerce")
     return df[["reviewer", "date", "link", "text"]]
 
 
+def _date_sort_key(col: pd.Series) -> pd.Series:
+    # Dates stay as the source's strings for display/export and are only parsed
+    # to sort. Scraped dates are ISO, so a fixed format plus the repeat-value
+    # cache avoids dateutil.
+    if col.name != "date":
+        return col
+    with np.errstate(all="ignore"):
+        return pd.to_datetime(col, errors="coerce", format="ISO8601", cache=True)
+
+
+def sort_reviews(df: pd.DataFrame, sort_by: str) -> pd.DataFrame:
+    if sort_by == "score_desc":
+        return df.sort_values(by=["score"], ascending=False)
+    elif sort_by == "score_asc":
+        return df.sort_values(by=["score"], ascending=True)
+    elif sort_by == "date_asc":
+        return df.sort_values(by=["date", "reviewer"], ascending=[True, True], key=_date_sort_key)
+    elif sort_by == "date_desc":
+        return df.sort_values(by=["date", "reviewer"], ascending=[False, True], key=_date_sort_key)
+    elif sort_by == "reviewer_asc":
+        return df.sort_values(by=["reviewer"], ascending=True)
+    elif sort_by == "reviewer_desc":
+        return df.sort_values(by=["reviewer"], ascending=False)
+    return df
+
+
 # Model configurations - name, size, description
 MODEL_CONFIGS = {
     "fast": {
         "name": "sentence-transformers/all-MiniLM-L6-v2",
         "size": "~90MB",
         "description": "Fast - Good for quick searches",
-        "batch_size": 64
+        "batch_size": 64,
+        "max_seq_length": 256
     },
     "balanced": {
         "name": "sentence-transformers/all-mpnet-base-v2",
         "size": "~1.6GB",
         "description": "Balanced - Best speed/accuracy trade-off (your yesterday's model)",
-        "batch_size": 32
+        "batch_size": 32,
+        "max_seq_length": 384
     },
     "precise": {
         "name": "sentence-transformers/all-mpnet-base-v2",
         "size": "~1.6GB",
         "description": "Precise - Highest accuracy, smaller batches for precision",
-        "batch_size": 16
+        "batch_size": 16,
+        "max_seq_length": 384
     }
 }
 
+class OnnxEncoder:
+    """CPU stand-in for SentenceTransformer.encode backed by an int8-quantized ONNX export.
+
+    Mean-pools the last hidden state over the attention mask, which is what the
+    MiniLM/MPNet sentence-transformers checkpoints do.
+    """
+
+    device = torch.device("cpu")
+
+    def __init__(self, model_name: str, max_seq_length: int = 256):
+        export_dir = ONNX_DIR / model_name.replace("/", "__")
+        if not (export_dir / "model_quantized.onnx").exists():
+            print(f"Exporting {model_name} to ONNX (one-time)...")
+            ORTModelForFeatureExtraction.from_pretrained(model_name, export=True).save_pretrained(export_dir)
+            AutoTokenizer.from_pretrained(model_name).save_pretrained(export_dir)
+            qconfig = AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+            ORTQuantizer.from_pretrained(export_dir).quantize(save_dir=export_dir, quantization_config=qconfig)
+        self.tokenizer = AutoTokenizer.from_pretrained(export_dir)
+        self.model = ORTModelForFeatureExtraction.from_pretrained(
+            export_dir, file_name="model_quantized.onnx", provider="CPUExecutionProvider"
+        )
+        self.max_seq_length = max_seq_length
+
+    def encode(self, texts: List[str], batch_size: int = 32, convert_to_tensor: bool = False,
+               show_progress_bar: bool = False, normalize_embeddings: bool = False):
+        chunks = []
+        for start in range(0, len(texts), batch_size):
+            batch = self.tokenizer(texts[start:start + batch_size], padding=True, truncation=True,
+                                   max_length=self.max_seq_length, return_tensors="pt")
+            hidden = self.model(**batch).last_hidden_state
+            mask = batch["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            emb = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            if normalize_embeddings:
+                emb = torch.nn.functional.normalize(emb, p=2, dim=1)
+            chunks.append(emb)
+            if show_progress_bar:
+                print(f"Encoded {min(start + batch_size, len(texts))}/{len(texts)}")
+        emb = torch.cat(chunks) if chunks else torch.zeros((0, self.model.config.hidden_size))
+        return emb if convert_to_tensor else emb.numpy()
+
+
 # Global model cache
 MODEL_CACHE = {}
 
-def load_model(model_type: str = "fast") -> SentenceTransformer:
+def load_model(model_type: str = "fast") -> SentenceTransformer | OnnxEncoder:
     """Load a model, caching it for reuse"""
     if model_type not in MODEL_CONFIGS:
         model_type = "fast"  # fallback
@@ -126,9 +301,24 @@ def load_model(model_type: str = "fast") -> SentenceTransformer:
 
     device = "cuda" if torch.cuda.is_available() else "cpu"
     print(f"Using device: {device}")
+    if device == "cuda":
+        # Allow TF32 matmuls on Ampere+ GPUs
+        torch.set_float32_matmul_precision("high")
 
     try:
-        model = SentenceTransformer(config["name"], device=device)
+        model = None
+        if HAS_ONNX and device == "cpu":
+            # Quantized ONNX Runtime is several times faster than PyTorch on CPU
+            try:
+                model = OnnxEncoder(config["name"], config["max_seq_length"])
+            except Exception as e:
+                print(f"⚠️ ONNX export unavailable ({e}), using PyTorch instead")
+        if model is None:
+            model = SentenceTransformer(config["name"], device=device)
+            if device == "cuda" and hasattr(torch, "compile"):
+                # Compile the transformer itself; encode() calls it directly, so
+                # wrapping the SentenceTransformer object would be bypassed
+                model[0].auto_model = torch.compile(model[0].auto_model, dynamic=True)
         MODEL_CACHE[model_type] = model
         print(f"✅ {model_type} model loaded successfully!")
         return model
@@ -142,33 +332,97 @@ DEFAULT_MODEL = "fast"
 MODEL = load_model(DEFAULT_MODEL)
 
 
-def semantic_filter(df: pd.DataFrame, query: str, model_type: str = "fast") -> Tuple[pd.DataFrame, np.ndarray]:
-    # Get the appropriate model
+def embed_cache_path(src: Path, model_type: str, backend: str) -> Path:
+    """Cache file for a source's review embeddings; changes whenever the file is modified.
+
+    The backend is part of the key: ONNX int8 and PyTorch vectors must never be mixed.
+    """
+    key = f"{src.resolve()}|{src.stat().st_mtime_ns}|{model_type}|{backend}"
+    return EMBED_CACHE_DIR / f"{hashlib.sha1(key.encode('utf-8')).hexdigest()}.npy"
+
+
+def save_embed_cache(cache_file: Path, emb: np.ndarray) -> None:
+    """Atomically write a cache file, then drop the oldest beyond EMBED_CACHE_MAX_FILES"""
+    EMBED_CACHE_DIR.mkdir(exist_ok=True)
+    tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+    with open(tmp_file, "wb") as f:
+        np.save(f, emb)
+    os.replace(tmp_file, cache_file)
+
+    # Every edit of a source (new mtime) produces a new key, so old entries pile up
+    entries = sorted(EMBED_CACHE_DIR.glob("*.npy"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in entries[EMBED_CACHE_MAX_FILES:]:
+        old.unlink(missing_ok=True)
+
+
+def encode_reviews(texts: List[str], model_type: str, src: Path | None = None) -> torch.Tensor:
+    """Encode review texts, loading them from the on-disk cache when src hasn't changed"""
     model = load_model(model_type)
     config = MODEL_CONFIGS[model_type]
 
+    # Uploads are one-off copies, so caching their embeddings would never pay off
+    cacheable = src is not None and src.exists() and not src.name.startswith(UPLOAD_PREFIX)
+    cache_file = embed_cache_path(src, model_type, type(model).__name__) if cacheable else None
+    cached = None
+    if cache_file is not None and cache_file.exists():
+        try:
+            cached = np.load(cache_file)
+        except (OSError, ValueError, EOFError):
+            print(f"⚠️ Ignoring unreadable embedding cache {cache_file.name}")
+        if cached is not None and len(cached) == len(texts):
+            print(f"Using cached embeddings ({cache_file.name})")
+            return torch.from_numpy(cached).to(model.device)
+
+    # Batch encode with progress; inference_mode drops autograd bookkeeping
+    with torch.inference_mode():
+        emb_reviews = model.encode(
+            texts,
+            batch_size=config['batch_size'],
+            convert_to_tensor=True,
+            show_progress_bar=True,  # Show progress bar
+            normalize_embeddings=True
+        )
+    # Normalized embeddings lose nothing meaningful for ranking in fp16, and it
+    # halves both the memory held here and the size of the cache file
+    emb_reviews = emb_reviews.half()
+    if cache_file is not None:
+        save_embed_cache(cache_file, emb_reviews.cpu().numpy())
+    return emb_reviews
+
+
+@functools.lru_cache(maxsize=128)
+def encode_query(query: str, model_type: str) -> np.ndarray:
+    model = load_model(model_type)
+    with torch.inference_mode():
+        return model.encode([query], convert_to_tensor=True, normalize_embeddings=True).cpu().numpy()[0]
+
+
+def semantic_filter(df: pd.DataFrame, query: str, model_type: str = "fast", threshold: float = -1.0, src: Path | None = None) -> Tuple[pd.DataFrame, np.ndarray]:
+    """Score reviews against the query and keep only those scoring at least threshold"""
+    config = MODEL_CONFIGS[model_type]
+
     texts = df["text"].fillna("").astype(str).tolist()
     print(f"Processing {len(texts)} reviews with {model_type} model ({config['name']})...")
     print(f"Model size: {config['size']}, Batch size: {config['batch_size']}")
 
-    # Batch encode with progress
-    emb_reviews = model.encode(
-        texts,
-        batch_size=config['batch_size'],
-        convert_to_tensor=True,
-        show_progress_bar=True,  # Show progress bar
-        normalize_embeddings=True
-    )
+    emb_reviews = encode_reviews(texts, model_type, src)
+    if emb_reviews.device.type == "cpu":
+        # Half-precision matmul is slow (or missing) on most CPUs; upcast for scoring only
+        emb_reviews = emb_reviews.float()
     print("Encoding query...")
-    emb_query = model.encode([query], convert_to_tensor=True, normalize_embeddings=True)
+    emb_query = torch.from_numpy(encode_query(query, model_type)).to(emb_reviews.device, emb_reviews.dtype)
 
     print("Computing similarity scores...")
-    scores = util.cos_sim(emb_query, emb_reviews).cpu().numpy()[0]
+    # Both sides are L2-normalized, so the dot product is the cosine similarity.
+    # Threshold on-device so only the surviving rows come back to pandas.
+    scores = (emb_reviews @ emb_query).float()
+    idx = torch.nonzero(scores >= threshold, as_tuple=True)[0]
+    sel_scores = scores[idx].cpu().numpy()
+    sel_idx = idx.cpu().numpy()
 
-    df = df.copy()
-    df["score"] = scores
-    print(f"AI processing complete. Score range: {scores.min():.3f} to {scores.max():.3f}")
-    return df, scores
+    if len(scores):
+        print(f"AI processing complete. Score range: {scores.min().item():.3f} to {scores.max().item():.3f}, {len(sel_idx)} above {threshold}")
+    return df.iloc[sel_idx].assign(score=sel_scores), sel_scores
 
 
 @app.get("/", response_class=HTMLResponse)
@@ -306,7 +560,7 @@ async def search(
     # Determine source: uploaded file takes precedence, otherwise path
     temp_uploaded: Path | None = None
     if upload is not None and upload.filename:
-        temp_uploaded = (PROJECT_DIR / f"_uploaded_{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{upload.filename}")
+        temp_uploaded = (PROJECT_DIR / f"{UPLOAD_PREFIX}{datetime.now().strftime('%Y%m%d_%H%M%S_%f')}_{upload.filename}")
         content = await upload.read()
         with open(temp_uploaded, "wb") as f:
             f.write(content)
@@ -314,23 +568,16 @@ async def search(
     else:
         src = Path(file_path)
     df = read_reviews(src)
-    filtered, scores = semantic_filter(df, query, model_type)
-    # Apply threshold
-    filtered = filtered[filtered["score"] >= float(threshold)]
+    filtered, scores = semantic_filter(df, query, model_type, threshold=float(threshold), src=src)
 
     # Sorting
-    if sort_by == "score_desc":
-        filtered = filtered.sort_values(by=["score"], ascending=False)
-    elif sort_by == "score_asc":
-        filtered = filtered.sort_values(by=["score"], ascending=True)
-    elif sort_by == "date_asc":
-        filtered = filtered.sort_values(by=["date", "reviewer"], ascending=[True, True])
-    elif sort_by == "date_desc":
-        filtered = filtered.sort_values(by=["date", "reviewer"], ascending=[False, True])
-    elif sort_by == "reviewer_asc":
-        filtered = filtered.sort_values(by=["reviewer"], ascending=True)
-    elif sort_by == "reviewer_desc":
-        filtered = filtered.sort_values(by=["reviewer"], ascending=False)
+    filtered = sort_reviews(filtered, sort_by)
+
+    token = search_token(src, query, model_type, float(threshold), sort_by)
+    SEARCH_CACHE[token] = filtered
+    SEARCH_CACHE.move_to_end(token)
+    while len(SEARCH_CACHE) > SEARCH_CACHE_SIZE:
+        SEARCH_CACHE.popitem(last=False)
 
     # Render results
     meta = {
@@ -349,82 +596,41 @@ async def search(
 @app.post("/export")
 async def export(file_path: str = Form(...), query: str = Form(...), sort_by: str = Form("score_desc"), threshold: float = Form(0.35), model_type: str = Form("fast")):
     src = Path(file_path)
-    df = read_reviews(src)
-    filtered, _ = semantic_filter(df, query, model_type)
-    filtered = filtered[filtered["score"] >= float(threshold)]
+    # Reuse the already scored and sorted rows from /search when they're still cached
+    # (the token covers the file's mtime, so an edited source is a miss)
+    filtered = SEARCH_CACHE.get(search_token(src, query, model_type, float(threshold), sort_by)) if src.exists() else None
+    if filtered is None:
+        df = read_reviews(src)
+        filtered, _ = semantic_filter(df, query, model_type, threshold=float(threshold), src=src)
 
-    # Apply same sort as UI
-    if sort_by == "score_desc":
-        filtered = filtered.sort_values(by=["score"], ascending=False)
-    elif sort_by == "score_asc":
-        filtered = filtered.sort_values(by=["score"], ascending=True)
-    elif sort_by == "date_asc":
-        filtered = filtered.sort_values(by=["date", "reviewer"], ascending=[True, True])
-    elif sort_by == "date_desc":
-        filtered = filtered.sort_values(by=["date", "reviewer"], ascending=[False, True])
-    elif sort_by == "reviewer_asc":
-        filtered = filtered.sort_values(by=["reviewer"], ascending=True)
-    elif sort_by == "reviewer_desc":
-        filtered = filtered.sort_values(by=["reviewer"], ascending=False)
+        # Apply same sort as UI
+        filtered = sort_reviews(filtered, sort_by)
 
     # Prepare in-memory ZIP for browser download so user picks location
     import io, zipfile
     ts = datetime.now().strftime("%Y-%m-%d_%H-%M-%S")
-    safe_query = re.sub(r"[^a-zA-Z0-9_\-]+", "_", query.strip())[:120]
+    safe_query = UNSAFE_QUERY_RE.sub("_", query.strip())[:120]
     zip_buf = io.BytesIO()
     with zipfile.ZipFile(zip_buf, mode="w", compression=zipfile.ZIP_DEFLATED) as z:
         # CSV
         csv_bytes = filtered[["reviewer", "date", "link", "text", "score"]].to_csv(index=False).encode("utf-8")
         z.writestr("results.csv", csv_bytes)
         # JSON
-        json_bytes = json.dumps({
+        json_bytes = orjson.dumps({
             "source": src.name,
             "query": query,
             "threshold": float(threshold),
             "reviews": filtered[["reviewer", "date", "link", "text", "score"]].fillna("").to_dict(orient="records")
-        }, ensure_ascii=False, indent=2, default=str).encode("utf-8")
+        }, default=str, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_SERIALIZE_NUMPY)
         z.writestr("results.json", json_bytes)
         # HTML
-        html_items = []
-        for r in filtered.fillna("").to_dict(orient="records"):
-            html_items.append(f"""
-            <div class='card'>
-                <div class='reviewer'>{r['reviewer']}</div>
-                <div class='date'>{r['date']}</div>
-                <div class='score'>Match score: {r.get('score', 0):.3f}</div>
-                <div class='link'><a href='{r['link']}' target='_blank'>{r['link']}</a></div>
-                <div class='text'>{r['text']}</div>
-            </div>
-            """)
-        html_doc = f"""
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <title>Exported Results</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; background: #f7fafc; padding: 20px; }}
-                h1 {{ text-align: center; color: #2d3748; }}
-                .summary {{ max-width: 1000px; margin: 0 auto 20px; background: #edf2f7; padding: 15px; border-radius: 8px; }}
-                .card {{ background: #fff; border: 1px solid #e2e8f0; border-radius: 8px; padding: 15px; margin: 15px auto; max-width: 1000px; box-shadow: 0 2px 5px rgba(0,0,0,0.05); }}
-                .reviewer {{ font-weight: bold; color: #2d3748; }}
-                .date {{ color: #718096; font-size: 0.9em; margin-bottom: 4px; }}
-                .score {{ color: #805ad5; font-size: 0.9em; margin-bottom: 8px; }}
-                .link a {{ color: #3182ce; text-decoration: none; }}
-                .text {{ margin-top: 8px; line-height: 1.5; color: #1a202c; white-space: pre-wrap; }}
-            </style>
-        </head>
-        <body>
-            <h1>Exported Results</h1>
-            <div class='summary'>
-                <strong>Source:</strong> {src.name}<br>
-                <strong>Query:</strong> {query}<br>
-                <strong>Threshold:</strong> {float(threshold)}<br>
-                <strong>Total:</strong> {len(filtered)}
-            </div>
-            {''.join(html_items)}
-        </body>
-        </html>
-        """
+        html_doc = EXPORT_HTML_TEMPLATE.render(
+            source=src.name,
+            query=query,
+            threshold=float(threshold),
+            total=len(filtered),
+            rows=filtered.fillna("").to_dict(orient="records"),
+        )
         z.writestr("results.html", html_doc)
     zip_buf.seek(0)
     filename = f"export_{safe_query}_{ts}.zip"
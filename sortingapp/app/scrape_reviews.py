@@ -2,16 +2,61 @@ import csv
 import json
 import time
 import os
-import glob
-import hashlib
-from datetime import datetime, timedelta
+import html
+import signal
+import shlex
+import sys
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime, timedelta
 from pathlib import Path
+from urllib.parse import urlsplit
 
 from selenium import webdriver
 from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.by import By
-from selenium.common.exceptions import NoSuchElementException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+from selenium.common.exceptions import TimeoutException, WebDriverException
 from webdriver_manager.chrome import ChromeDriverManager
+from webdriver_manager.core.driver_cache import DriverCacheManager
+
+try:
+    import orjson  # type: ignore
+    HAS_ORJSON = True
+except Exception:
+    HAS_ORJSON = False
+
+try:
+    import ahocorasick  # type: ignore
+    HAS_AHOCORASICK = True
+except Exception:
+    HAS_AHOCORASICK = False
+
+# Plain-HTTP fast path; the scraper falls back to Selenium without these
+try:
+    import httpx
+    from selectolax.lexbor import LexborHTMLParser
+    HAS_HTTP = True
+except ImportError:
+    HAS_HTTP = False
+
+# On-disk HTTP cache: pages are revalidated with ETag/Last-Modified, so
+# unchanged pages on repeat/resume runs cost a 304 instead of a full download
+try:
+    import hishel  # type: ignore
+    HAS_HISHEL = True
+except Exception:
+    HAS_HISHEL = False
+
+HTTP_CACHE_DIR = Path(__file__).resolve().parent / "cache" / "http"
+
+HTTP_HEADERS = {
+    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36",
+    "Accept-Language": "en-US,en;q=0.9",
+}
 
 # ----------------------- Helpers -----------------------
 
@@ -31,6 +76,7 @@ def make_filename(prefix, mode, pages=None, months=None, keywords=None, start_da
     return "_".join(parts)
 
 
+@functools.lru_cache(maxsize=None)
 def canonical_link(href: str | None) -> str:
     if not href:
         return ""
@@ -40,35 +86,75 @@ def canonical_link(href: str | None) -> str:
     return base.strip()
 
 
-def stable_review_key(reviewer: str, date_str: str, link: str, text: str) -> str:
+def stable_review_key(reviewer: str, date_str: str, link: str, text: str) -> tuple:
     """Create a robust identity for a review.
-    Prefer the canonical permalink when available; otherwise hash core fields.
+    Prefer the canonical permalink when available; otherwise hash the core fields.
+    Keys only live in the in-memory seen set, so the per-process hash() is enough.
     """
     link_key = canonical_link(link)
     if link_key:
-        return f"link::{link_key}"
-    digest = hashlib.sha256(
-        (reviewer.strip() + "|" + date_str.strip() + "|" + text.strip()).encode("utf-8")
-    ).hexdigest()
-    return f"hash::{digest}"
+        return ("link", link_key)
+    return ("hash", hash((reviewer.strip(), date_str.strip(), text.strip())))
+
+
+# Points at the most recently saved results.json, so --resume needn't scan old runs
+LATEST_POINTER = Path("europcar_reviews_latest.txt")
+
+# Reviews are held column-wise as (reviewers, dates, links, texts)
+REVIEW_FIELDS = ("reviewer", "date", "link", "text")
+
+HTML_HEADER_TMPL = """
+        <html>
+        <head>
+            <meta charset='utf-8'>
+            <title>Trustpilot Reviews</title>
+            <style>
+                body {{ font-family: Arial, sans-serif; background: #f2f2f2; padding: 20px; }}
+                h1 {{ text-align: center; color: #333; }}
+                .card {{ background: #fff; border: 1px solid #ccc; border-radius: 8px;
+                        padding: 15px; margin: 15px auto; max-width: 800px;
+                        box-shadow: 0 2px 5px rgba(0,0,0,0.1); transition: transform 0.2s; }}
+                .card:hover {{ transform: scale(1.02); }}
+                .reviewer {{ font-weight: bold; color: #222; }}
+                .date {{ color: #555; font-size: 0.9em; margin-bottom: 5px; }}
+                .link {{ color: #1a0dab; text-decoration: none; font-size: 0.9em; }}
+                .text {{ margin-top: 10px; line-height: 1.5; color: #333; white-space: pre-wrap; }}
+                .summary {{ max-width: 800px; margin: 20px auto; background: #eee; padding: 15px; border-radius: 8px; }}
+            </style>
+        </head>
+        <body>
+            <h1>Trustpilot Reviews</h1>
+            <div class="summary">
+                <strong>Total reviews scraped:</strong> {total}<br>
+                <strong>Date/time of scrape:</strong> {scraped_at}<br>
+                {criteria_text}
+            </div>
+        """
+
+# Markup matches what main.py and dedupe_results.py parse (div.card with single-quoted classes)
+CARD_TMPL = """
+            <div class='card'>
+                <div class='reviewer'>{reviewer}</div>
+                <div class='date'>{date}</div>
+                <div class='link'><a href='{link}' target='_blank'>{link}</a></div>
+                <div class='text'>{text}</div>
+            </div>
+            """
+
+HTML_FOOTER = "</body></html>"
+
+
+def review_dicts(columns):
+    return [dict(zip(REVIEW_FIELDS, row)) for row in zip(*columns)]
 
 
-def save_reviews(reviews, filename_base, mode=None, max_pages=None, months=None, keywords=None, start_date=None, end_date=None):
+def save_reviews(columns, filename_base, mode=None, max_pages=None, months=None, keywords=None, start_date=None, end_date=None):
     out_dir = Path(filename_base)
     out_dir.mkdir(parents=True, exist_ok=True)
-    csv_file = str(out_dir / "results.csv")
     json_file = str(out_dir / "results.json")
     html_file = str(out_dir / "results.html")
 
-    # CSV
-    with open(csv_file, "w", newline="", encoding="utf-8") as f:
-        writer = csv.DictWriter(f, fieldnames=["reviewer", "date", "link", "text"])
-        writer.writeheader()
-        writer.writerows(reviews)
-
-    # JSON
-    with open(json_file, "w", encoding="utf-8") as f:
-        json.dump({"reviews": reviews}, f, indent=2, ensure_ascii=False)
+    texts = columns[3]
 
     # Build search criteria text
     criteria_text = ""
@@ -88,138 +174,594 @@ def save_reviews(reviews, filename_base, mode=None, max_pages=None, months=None,
                 keyword_display.append(f"{clean_k} (AND)")
             else:
                 keyword_display.append(f"{k} (OR)")
-        criteria_text = f"<strong>Search criteria:</strong> Keywords - {', '.join(keyword_display)}<br>"
+        criteria_text = f"<strong>Search criteria:</strong> Keywords - {html.escape(', '.join(keyword_display))}<br>"
     elif mode == 4 and start_date and end_date:
         criteria_text = f"<strong>Search criteria:</strong> Date interval from {start_date} to {end_date}<br>"
 
+    if HAS_ORJSON:
+        dump_review = lambda r: orjson.dumps(r, option=orjson.OPT_INDENT_2)
+    else:
+        dump_review = lambda r: json.dumps(r, indent=2, ensure_ascii=False).encode("utf-8")
+
+    # One pass over the reviews feeds both outputs (results.csv is appended
+    # page by page while scraping)
+    esc = html.escape
+    json_parts = []
+    cards = []
+    for row in zip(*columns):
+        reviewer, day, link, text = row
+        # Indented to sit inside {"reviews": [...]}, same bytes as dumping the whole list
+        json_parts.append(b"    " + dump_review(dict(zip(REVIEW_FIELDS, row))).replace(b"\n", b"\n    "))
+        link = esc(link or "")
+        cards.append(CARD_TMPL.format(reviewer=esc(reviewer or ""), date=esc(day or ""), link=link, text=esc(text or "")))
+
+    # JSON
+    if json_parts:
+        Path(json_file).write_bytes(b'{\n  "reviews": [\n' + b",\n".join(json_parts) + b"\n  ]\n}")
+    else:
+        Path(json_file).write_bytes(b'{\n  "reviews": []\n}')
+
     # HTML
-    with open(html_file, "w", encoding="utf-8") as f:
-        f.write(f"""
-        <html>
-        <head>
-            <meta charset='utf-8'>
-            <title>Trustpilot Reviews</title>
-            <style>
-                body {{ font-family: Arial, sans-serif; background: #f2f2f2; padding: 20px; }}
-                h1 {{ text-align: center; color: #333; }}
-                .card {{ background: #fff; border: 1px solid #ccc; border-radius: 8px;
-                        padding: 15px; margin: 15px auto; max-width: 800px;
-                        box-shadow: 0 2px 5px rgba(0,0,0,0.1); transition: transform 0.2s; }}
-                .card:hover {{ transform: scale(1.02); }}
-                .reviewer {{ font-weight: bold; color: #222; }}
-                .date {{ color: #555; font-size: 0.9em; margin-bottom: 5px; }}
-                .link {{ color: #1a0dab; text-decoration: none; font-size: 0.9em; }}
-                .text {{ margin-top: 10px; line-height: 1.5; color: #333; white-space: pre-wrap; }}
-                .summary {{ max-width: 800px; margin: 20px auto; background: #eee; padding: 15px; border-radius: 8px; }}
-            </style>
-        </head>
-        <body>
-            <h1>Trustpilot Reviews</h1>
-            <div class="summary">
-                <strong>Total reviews scraped:</strong> {len(reviews)}<br>
-                <strong>Date/time of scrape:</strong> {datetime.now().strftime("%Y-%m-%d %H:%M:%S")}<br>
-                {criteria_text}
-            </div>
-        """)
-        for r in reviews:
-            f.write(f"""
-            <div class='card'>
-                <div class='reviewer'>{r['reviewer']}</div>
-                <div class='date'>{r['date']}</div>
-                <div class='link'><a href='{r['link']}' target='_blank'>{r['link']}</a></div>
-                <div class='text'>{r['text']}</div>
-            </div>
-            """)
-        f.write("</body></html>")
+    with open(html_file, "w", encoding="utf-8", buffering=1 << 20) as f:
+        f.write(HTML_HEADER_TMPL.format(
+            total=len(texts),
+            scraped_at=datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            criteria_text=criteria_text,
+        ))
+        f.write("".join(cards))
+        f.write(HTML_FOOTER)
+
+    tmp_pointer = LATEST_POINTER.with_suffix(".tmp")
+    tmp_pointer.write_text(json_file, encoding="utf-8")
+    os.replace(tmp_pointer, LATEST_POINTER)
+
+    print(f"\n💾 Saved {len(texts)} reviews to folder: {out_dir}")
+
+
+def write_page_delta(out_dir, page, columns):
+    """Write one page's new reviews to <out_dir>/pages/page_NNNNN.jsonl."""
+    reviews = review_dicts(columns)
+    if HAS_ORJSON:
+        data = b"".join(orjson.dumps(r) + b"\n" for r in reviews)
+    else:
+        data = "".join(json.dumps(r, ensure_ascii=False, separators=(",", ":")) + "\n" for r in reviews).encode("utf-8")
+    (Path(out_dir) / "pages" / f"page_{page:05d}.jsonl").write_bytes(data)
+
+
+def open_incremental_writers(filename_base):
+    """Open the outputs that grow page by page: results.csv and the pages/ delta folder."""
+    out_dir = Path(filename_base)
+    (out_dir / "pages").mkdir(parents=True, exist_ok=True)
+    csv_f = open(out_dir / "results.csv", "w", newline="", encoding="utf-8", buffering=1 << 20)
+    csv_w = csv.writer(csv_f)
+    csv_w.writerow(REVIEW_FIELDS)
+    return {"out_dir": out_dir, "csv_f": csv_f, "csv_w": csv_w}
+
+
+def append_reviews(writers, page, columns):
+    """Append one page's new reviews (as columns) to the incremental outputs."""
+    writers["csv_w"].writerows(zip(*columns))
+    writers["csv_f"].flush()
+    write_page_delta(writers["out_dir"], page, columns)
+
+
+def finalize_outputs(writers, columns, filename_base, **criteria):
+    """Close the incremental outputs and write the one-shot results.json/html."""
+    writers["csv_f"].close()
+    save_reviews(columns, filename_base, **criteria)
 
-    print(f"\n💾 Saved {len(reviews)} reviews to folder: {out_dir}")
+
+def load_page_deltas(pages_dir):
+    loads = orjson.loads if HAS_ORJSON else json.loads
+    return [
+        loads(line)
+        for f in sorted(Path(pages_dir).glob("page_*.jsonl"))
+        for line in f.read_bytes().splitlines()
+        if line
+    ]
+
+
+def find_latest_results(root="."):
+    """Newest europcar_reviews_* run folder (or legacy .json) under `root`.
+    Names end with the YYYY-MM-DD_HH-MM-SS run timestamp, so no stat is needed to order them.
+    """
+    candidates = []
+    with os.scandir(root) as it:
+        for entry in it:
+            if not entry.name.startswith("europcar_reviews_"):
+                continue
+            if entry.name.endswith(".json"):
+                candidates.append((entry.name[:-5][-19:], entry.path))
+            elif entry.is_dir():
+                results = os.path.join(entry.path, "results.json")
+                if os.path.exists(results):
+                    candidates.append((entry.name[-19:], results))
+    return max(candidates)[1] if candidates else None
 
 
 def load_previous_reviews(filename=None):
-    if filename and Path(filename).exists():
-        with open(filename, "r", encoding="utf-8") as f:
-            data = json.load(f)
-            reviews = data.get("reviews", [])
-            print(f"🔄 Loaded {len(reviews)} reviews from {filename}")
-            return reviews
-    return []
+    """Load a prior run's reviews as columns.
+    Falls back to the run's per-page deltas when it never got to write results.json.
+    """
+    if not filename:
+        return [], [], [], []
+    path = Path(filename)
+    pages_dir = path.parent / "pages"
+    if path.exists():
+        if HAS_ORJSON:
+            data = orjson.loads(path.read_bytes())
+        else:
+            with open(filename, "r", encoding="utf-8") as f:
+                data = json.load(f)
+        reviews = data.get("reviews", [])
+    elif pages_dir.is_dir():
+        reviews = load_page_deltas(pages_dir)
+        filename = str(pages_dir)
+    else:
+        return [], [], [], []
+    print(f"🔄 Loaded {len(reviews)} reviews from {filename}")
+    return tuple([r.get(field) for r in reviews] for field in REVIEW_FIELDS)
+
+
+# Per-card locators. Lookups use find_elements so a missing element is an
+# empty list rather than a NoSuchElementException.
+REVIEWER_NAME_LOC = (By.CSS_SELECTOR, "span[data-consumer-name-typography]")
+PERMALINK_LOC = (By.CSS_SELECTOR, "a[href*='/reviews/']")
+SEE_MORE_LOC = (By.CSS_SELECTOR, "button[data-service-review-toggle-text-show]")
+REVIEW_TEXT_LOC = (By.CSS_SELECTOR, "div[data-service-review-text-typography] p")
+PARAGRAPH_LOC = (By.CSS_SELECTOR, "p")
+TIME_LOC = (By.TAG_NAME, "time")
 
 
 def extract_reviewer_name(block):
-    try:
-        name = block.find_element(By.CSS_SELECTOR, "span[data-consumer-name-typography]").text.strip()
-        if name:
-            return name
-    except NoSuchElementException:
-        pass
-    return "Unknown"
+    els = block.find_elements(*REVIEWER_NAME_LOC)
+    name = els[0].text.strip() if els else ""
+    return name or "Unknown"
 
 
 def extract_review_permalink(block):
-    try:
-        a = block.find_element(By.CSS_SELECTOR, "a[href*='/reviews/']")
-        return a.get_attribute("href")
-    except NoSuchElementException:
-        return None
+    els = block.find_elements(*PERMALINK_LOC)
+    return els[0].get_attribute("href") if els else None
+
+
+# Upper bound for a "See more" expansion to settle; the old fixed sleep
+EXPAND_WAIT = 0.5
 
 
 def maybe_click_see_more(driver, block):
+    els = block.find_elements(*SEE_MORE_LOC)
+    if not els:
+        return
+    btn = els[0]
+    driver.execute_script("arguments[0].click();", btn)
     try:
-        btn = block.find_element(By.CSS_SELECTOR, "button[data-service-review-toggle-text-show]")
-        driver.execute_script("arguments[0].click();", btn)
-        time.sleep(0.5)
-    except NoSuchElementException:
+        WebDriverWait(driver, EXPAND_WAIT, poll_frequency=0.05).until(EC.staleness_of(btn))
+    except TimeoutException:
         pass
 
 
+# Longest non-teaser <p> in a card, picked in the browser (one round-trip)
+LONGEST_PARAGRAPH_JS = """
+return Array.from(arguments[0].querySelectorAll('p'))
+    .map(p => p.innerText.trim())
+    .filter(t => t && !t.endsWith('See more'))
+    .reduce((best, t) => t.length > best.length ? t : best, '');
+"""
+
+
 def extract_review_text(block):
     # Prefer the main review paragraph; ignore 'See more' teaser content
+    els = block.find_elements(*REVIEW_TEXT_LOC)
+    if els:
+        return els[0].text.strip()
     try:
-        main = block.find_element(By.CSS_SELECTOR, "div[data-service-review-text-typography] p")
-        return main.text.strip()
-    except NoSuchElementException:
-        ps = block.find_elements(By.CSS_SELECTOR, "p")
-        texts = [p.text.strip() for p in ps if p.text.strip() and not p.text.strip().endswith("See more")]
+        return block.parent.execute_script(LONGEST_PARAGRAPH_JS, block) or ""
+    except WebDriverException:
+        texts = []
+        for p in block.find_elements(*PARAGRAPH_LOC):
+            t = p.text.strip()
+            if t and not t.endswith("See more"):
+                texts.append(t)
         return max(texts, key=len) if texts else ""
 
 
-# ----------------------- Scraper -----------------------
+def make_keyword_filter(kand_lc, kor_lc):
+    """Return a predicate over lowercased review text, or None if every review passes.
+    AND keywords must all match; OR keywords only apply when there are no AND keywords.
+    """
+    if kand_lc:
+        words, need_all = set(kand_lc), True
+    elif kor_lc:
+        words, need_all = set(kor_lc), False
+    else:
+        return None
+    if not need_all and "" in words:
+        return None  # an empty keyword matches everything
+    words.discard("")
+    if not words:
+        return None
 
-def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, resume=False, headless=True, start_date=None, end_date=None, resume_file=None):
-    reviews = []
-    seen_keys = set()
-    cutoff_date = datetime.now() - timedelta(days=30 * months) if months else None
-    start_dt = datetime.strptime(start_date, "%Y-%m-%d") if start_date else None
-    end_dt = datetime.strptime(end_date, "%Y-%m-%d") if end_date else None
+    if HAS_AHOCORASICK:
+        # One pass over the text regardless of how many keywords there are
+        automaton = ahocorasick.Automaton()
+        for w in words:
+            automaton.add_word(w, w)
+        automaton.make_automaton()
+        if need_all:
+            return lambda text_lc: len({w for _, w in automaton.iter(text_lc)}) == len(words)
+        return lambda text_lc: next(automaton.iter(text_lc), None) is not None
+
+    if need_all:
+        return lambda text_lc: all(w in text_lc for w in words)
+    return lambda text_lc: any(w in text_lc for w in words)
+
+
+TOGGLE_SELECTOR = "article button[data-service-review-toggle-text-show]"
 
+# Expands truncated reviews: every article, or only those at the indexes in
+# arguments[0]. Returns [clicked, toggles expected to remain afterwards]
+EXPAND_REVIEWS_JS = """
+const articles = Array.from(document.querySelectorAll('article'));
+const targets = arguments[0] ? arguments[0].map(i => articles[i]) : articles;
+const total = document.querySelectorAll("%s").length;
+let clicked = 0;
+targets.forEach(a => {
+    const b = a && a.querySelector('button[data-service-review-toggle-text-show]');
+    if (b) { b.click(); clicked++; }
+});
+return [clicked, total - clicked];
+""" % TOGGLE_SELECTOR
+
+# Reads every review card in a single WebDriver round-trip, mirroring
+# extract_reviewer_name / extract_review_permalink / extract_review_text
+EXTRACT_REVIEWS_JS = """
+return Array.from(document.querySelectorAll('article')).map(a => {
+    const name = a.querySelector('span[data-consumer-name-typography]');
+    const link = a.querySelector("a[href*='/reviews/']");
+    const main = a.querySelector('div[data-service-review-text-typography] p');
+    let text = '';
+    if (main) {
+        text = main.innerText.trim();
+    } else {
+        const texts = Array.from(a.querySelectorAll('p'))
+            .map(p => p.innerText.trim())
+            .filter(t => t && !t.endsWith('See more'));
+        text = texts.reduce((best, t) => t.length > best.length ? t : best, '');
+    }
+    const time = a.querySelector('time');
+    return {
+        reviewer: (name && name.innerText.trim()) || 'Unknown',
+        link: link ? link.href : null,
+        text: text,
+        datetime: time ? time.getAttribute('datetime') : null,
+    };
+});
+"""
+
+
+def expand_reviews(driver, indexes=None):
+    """Click the See-more toggles (optionally only on some articles); returns how many were clicked."""
+    clicked, remaining = driver.execute_script(EXPAND_REVIEWS_JS, indexes)
+    if clicked:
+        try:
+            WebDriverWait(driver, EXPAND_WAIT, poll_frequency=0.05).until(
+                lambda d: len(d.find_elements(By.CSS_SELECTOR, TOGGLE_SELECTOR)) <= remaining
+            )
+        except TimeoutException:
+            pass
+    return clicked
+
+
+def extract_page_reviews(driver, wanted=None):
+    """Return [{reviewer, link, text, datetime}] for every article on the loaded page.
+
+    `wanted(row)` may reject cards from their link/datetime alone; those are not
+    expanded, so their text can stay truncated (the caller drops them anyway).
+    """
+    try:
+        if wanted is None:
+            expand_reviews(driver)
+            return driver.execute_script(EXTRACT_REVIEWS_JS) or []
+        rows = driver.execute_script(EXTRACT_REVIEWS_JS) or []
+        indexes = [i for i, row in enumerate(rows) if wanted(row)]
+        if indexes and expand_reviews(driver, indexes):
+            rows = driver.execute_script(EXTRACT_REVIEWS_JS) or []
+        return rows
+    except WebDriverException:
+        pass
+
+    # Fallback: per-element lookups (one WebDriver round-trip each)
+    rows = []
+    for block in driver.find_elements(By.CSS_SELECTOR, "article"):
+        times = block.find_elements(*TIME_LOC)
+        datetime_attr = times[0].get_attribute("datetime") if times else None
+        row = {
+            "reviewer": extract_reviewer_name(block),
+            "link": extract_review_permalink(block),
+            "datetime": datetime_attr,
+        }
+        if wanted is None or wanted(row):
+            maybe_click_see_more(driver, block)
+        row["text"] = extract_review_text(block)
+        rows.append(row)
+    return rows
+
+
+def make_http_client():
+    if not HAS_HTTP:
+        return None
+    client_cls = httpx.Client
+    kwargs = dict(headers=HTTP_HEADERS, timeout=15, follow_redirects=True, limits=httpx.Limits(max_connections=16))
+    if HAS_HISHEL:
+        client_cls = hishel.CacheClient
+        kwargs["storage"] = hishel.FileStorage(base_path=HTTP_CACHE_DIR)
+        kwargs["controller"] = hishel.Controller(cacheable_methods=["GET"], cacheable_status_codes=[200], always_revalidate=True)
+    try:
+        return client_cls(http2=True, **kwargs)
+    except ImportError:
+        # http2 needs the optional 'h2' package
+        return client_cls(**kwargs)
+
+
+# Minimum spacing between page request starts (shared by all fetch threads).
+# Doubles on HTTP 429 / empty pages and decays back on success.
+MIN_PAGE_INTERVAL = 1.5
+MAX_PAGE_INTERVAL = 30.0
+
+
+class PageRateLimiter:
+    def __init__(self, interval=MIN_PAGE_INTERVAL):
+        self.base = self.interval = interval
+        self._next_start = 0.0
+        self._lock = threading.Lock()
+
+    def wait(self):
+        """Block until this caller's request slot; slots are `interval` apart."""
+        with self._lock:
+            now = time.monotonic()
+            start = max(now, self._next_start)
+            self._next_start = start + self.interval
+        if start > now:
+            time.sleep(start - now)
+
+    def backoff(self):
+        with self._lock:
+            self.interval = min(self.interval * 2, MAX_PAGE_INTERVAL)
+            self._next_start = max(self._next_start, time.monotonic() + self.interval)
+
+    def success(self):
+        with self._lock:
+            self.interval = max(self.base, self.interval / 2)
+
+
+class PageFetchError(Exception):
+    """A page still couldn't be downloaded after all retries."""
+
+
+def fetch_page_reviews_http(client, url, limiter=None, max_retries=3):
+    """Read a results page's reviews from its embedded __NEXT_DATA__ JSON.
+
+    Returns the same [{reviewer, link, text, datetime}] shape as extract_page_reviews,
+    or None when the page has no __NEXT_DATA__ or its layout isn't recognised.
+    Network errors, HTTP 429 and 5xx are retried (backing off the limiter, if
+    given) and raise PageFetchError once max_retries is used up.
+    """
+    for attempt in range(1, max_retries + 1):
+        if limiter is not None:
+            limiter.wait()
+        try:
+            resp = client.get(url)
+        except httpx.HTTPError as e:
+            error = str(e) or type(e).__name__
+        else:
+            if resp.status_code == 404:
+                return []  # past the last page
+            if resp.status_code != 429 and resp.status_code < 500:
+                break
+            error = f"HTTP {resp.status_code}"
+        print(f"⚠️ HTTP fetch failed (attempt {attempt}): {error}")
+        if attempt < max_retries:
+            if limiter is not None:
+                limiter.backoff()
+            else:
+                time.sleep(5)
+    else:
+        raise PageFetchError(f"Max retries reached for {url}")
+
+    node = LexborHTMLParser(resp.text).css_first("script#__NEXT_DATA__")
+    if node is None:
+        return None
+    try:
+        items = json.loads(node.text())["props"]["pageProps"]["reviews"]
+    except (ValueError, KeyError, TypeError):
+        return None
+
+    origin = "{0.scheme}://{0.netloc}".format(urlsplit(str(resp.url)))
+    rows = []
+    for item in items:
+        consumer = item.get("consumer") or {}
+        rows.append({
+            "reviewer": (consumer.get("displayName") or "").strip() or "Unknown",
+            "link": f"{origin}/reviews/{item['id']}" if item.get("id") else None,
+            "text": (item.get("text") or "").strip(),
+            "datetime": (item.get("dates") or {}).get("publishedDate"),
+        })
+    return rows
+
+
+# Resources that never contribute to the scraped data. Stylesheets are kept:
+# the extraction script reads innerText, which depends on computed styles.
+BLOCKED_URLS = [
+    "*.png", "*.jpg", "*.jpeg", "*.webp", "*.gif", "*.svg", "*.ico",
+    "*.woff", "*.woff2", "*.ttf", "*.otf", "*.mp4", "*.webm",
+    "*google-analytics*", "*googletagmanager*", "*doubleclick*",
+]
+
+
+_DRIVER_INSTALL_LOCK = threading.Lock()
+
+
+@functools.lru_cache(maxsize=1)
+def get_driver_path():
+    # A pinned driver in $CHROMEDRIVER skips webdriver_manager entirely; otherwise
+    # resolve once per process and trust the on-disk copy for 30 days
+    if os.environ.get("CHROMEDRIVER"):
+        return os.environ["CHROMEDRIVER"]
+    with _DRIVER_INSTALL_LOCK:  # browser workers may start together
+        return ChromeDriverManager(cache_manager=DriverCacheManager(valid_range=30)).install()
+
+
+def build_driver(headless=True):
     options = webdriver.ChromeOptions()
     if headless:
         options.add_argument("--headless=new")
     options.add_argument("--no-sandbox")
     options.add_argument("--disable-dev-shm-usage")
     options.add_argument("--window-size=1920,1080")
+    options.add_argument("--blink-settings=imagesEnabled=false")
+    options.add_argument("--disable-blink-features=AutomationControlled")
+    # Return from driver.get() at DOMContentLoaded; the WebDriverWait on the
+    # review cards covers anything rendered after that
+    options.page_load_strategy = "eager"
+    # chromedriver gets its own session so a Ctrl+C in the terminal (e.g. in
+    # --repl mode) reaches only this script, never the browser it drives
+    service = Service(get_driver_path(), popen_kw={"start_new_session": True})
+    driver = webdriver.Chrome(service=service, options=options)
+    # All waits are explicit (WebDriverWait); lookups must never block
+    driver.implicitly_wait(0)
+    try:
+        driver.execute_cdp_cmd("Network.enable", {})
+        driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": BLOCKED_URLS})
+    except WebDriverException as e:
+        print(f"⚠️ Could not enable request blocking: {e}")
+    return driver
+
+
+def load_page_in_browser(driver, url, page, max_retries=3, wanted=None):
+    """Load a results page in `driver` and extract its reviews; None if it never loaded."""
+    for attempt in range(1, max_retries + 1):
+        try:
+            driver.get(url)
+            try:
+                WebDriverWait(driver, 5).until(EC.presence_of_element_located((By.CSS_SELECTOR, "article")))
+            except TimeoutException:
+                pass  # no cards on this page; handled by the caller
+            return extract_page_reviews(driver, wanted)
+        except WebDriverException as e:
+            print(f"⚠️ Failed to load page {page} (attempt {attempt}): {e}")
+            if attempt < max_retries:
+                time.sleep(5)
+    print(f"❌ Max retries reached, skipping page {page}.")
+    return None
+
+
+# ----------------------- Scraper -----------------------
+
+def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, resume=False, headless=True, start_date=None, end_date=None, resume_file=None, fetch_window=4, browser_workers=4, use_browser=False, driver=None, min_page_interval=MIN_PAGE_INTERVAL):
+    columns = reviewers, dates, links, texts = [], [], [], []
+    seen_keys = set()
+    # Review dates are compared as ISO strings (YYYY-MM-DD sorts lexically)
+    cutoff_date = datetime.now() - timedelta(days=30 * months) if months else None
+    cutoff_s = cutoff_date.date().isoformat() if cutoff_date else None
+    start_s = date.fromisoformat(start_date).isoformat() if start_date else None
+    end_s = date.fromisoformat(end_date).isoformat() if end_date else None
+
+    # Pages are read over plain HTTP when possible; browsers are only started
+    # if that fails (e.g. the embedded JSON changes shape)
+    http_client = None if use_browser else make_http_client()
+
+    # Browser fallback: one Chrome per pool thread, created on first use
+    # (a WebDriver must not be shared between threads). A caller-supplied
+    # driver, or a callable that returns one on first use, is used as the only
+    # browser worker and is left running.
+    thread_state = threading.local()
+    drivers = []
+    drivers_lock = threading.Lock()
+    if driver is not None:
+        browser_workers = 1
+
+    def fetch_in_browser(page_url, page_no):
+        if driver is not None:
+            worker = driver() if callable(driver) else driver
+        else:
+            worker = getattr(thread_state, "driver", None)
+        if worker is None:
+            worker = thread_state.driver = build_driver(headless)
+            with drivers_lock:
+                drivers.append(worker)
+        limiter.wait()
+        return load_page_in_browser(worker, page_url, page_no, wanted=needs_full_text)
+
+    def needs_full_text(row):
+        # Mirrors the cheap rejections in the card loop below, so cards that
+        # will be dropped anyway aren't expanded. Keyword matching can't be used
+        # here: a truncated text may still contain the keyword once expanded.
+        link = canonical_link(row.get("link"))
+        if link and ("link", link) in seen_keys:
+            return False
+        day = (row.get("datetime") or "").split("T")[0]
+        if start_s and day < start_s:
+            return False
+        if end_s and day > end_s:
+            return False
+        return True
+
+    def fetch_over_http(page_url, page_no):
+        return fetch_page_reviews_http(http_client, page_url, limiter)
+
+    url_prefix = f"{base_url}&sort=recency&page="
+    limiter = PageRateLimiter(min_page_interval)
+
+    # The next `window` pages are fetched speculatively in parallel; results
+    # are still consumed strictly in page order below
+    if http_client is not None:
+        fetch_page, window = fetch_over_http, fetch_window
+    else:
+        fetch_page, window = fetch_in_browser, browser_workers
+    fetch_pool = ThreadPoolExecutor(max_workers=window)
+    prefetched = {}
+    next_fetch = 1
+
+    def page_blocks(page_no):
+        nonlocal next_fetch
+        next_fetch = max(next_fetch, page_no)
+        while next_fetch < page_no + window and not (mode == 1 and max_pages and next_fetch > max_pages):
+            prefetched[next_fetch] = fetch_pool.submit(fetch_page, f"{url_prefix}{next_fetch}", next_fetch)
+            next_fetch += 1
+        return prefetched.pop(page_no).result()
 
-    driver = webdriver.Chrome(service=Service(ChromeDriverManager().install()), options=options)
-    max_retries = 3
     page = 1
     interrupted = False
 
     filename_base = make_filename("europcar_reviews", mode, max_pages, months, keywords, start_date, end_date)
     if resume:
         source_json = None
-        if resume_file and Path(resume_file).exists():
+        if resume_file and (Path(resume_file).exists() or (Path(resume_file).parent / "pages").is_dir()):
             source_json = str(resume_file)
+        elif LATEST_POINTER.exists() and Path(LATEST_POINTER.read_text(encoding="utf-8").strip()).exists():
+            source_json = LATEST_POINTER.read_text(encoding="utf-8").strip()
         else:
-            json_files = glob.glob("europcar_reviews_*/results.json") + glob.glob("europcar_reviews_*.json")
-            if json_files:
-                source_json = max(json_files, key=os.path.getctime)
+            source_json = find_latest_results()
         if source_json:
-            reviews = load_previous_reviews(source_json)
-            for r in reviews:
-                key = stable_review_key(r.get("reviewer", ""), r.get("date", ""), r.get("link", ""), r.get("text", ""))
-                seen_keys.add(key)
+            columns = reviewers, dates, links, texts = load_previous_reviews(source_json)
+            seen_keys = {
+                stable_review_key(reviewer or "", day or "", link or "", text or "")
+                for reviewer, day, link, text in zip(*columns)
+            }
             print(f"🔄 Resuming from {source_json}")
 
+    # Each page's new reviews go to results.csv and a pages/page_NNNNN.jsonl
+    # delta as they arrive; the full JSON/HTML bundle is only written at the end
+    # (page 0 holds any resumed reviews)
+    writers = open_incremental_writers(filename_base)
+    if texts:
+        append_reviews(writers, 0, columns)
+    last_saved_idx = len(texts)
+    # Page appends run on one background thread (keeps them in order) so the
+    # next page is processed meanwhile; at most one append is outstanding
+    save_pool = ThreadPoolExecutor(max_workers=1)
+    pending_save = None
+
     # Prepare keyword filters
     keyword_and = []
     keyword_or = []
@@ -230,6 +772,7 @@ def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, r
                 keyword_and.append(k.replace("+", "").replace("AND", "").strip())
             else:
                 keyword_or.append(k)
+    keyword_filter = make_keyword_filter([k.lower() for k in keyword_and], [k.lower() for k in keyword_or])
 
     # Termination safety
     consecutive_no_additions = 0
@@ -243,30 +786,33 @@ def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, r
                 print(f"⏹ Reached page limit {max_pages}. Stopping.")
                 break
 
-            url = f"{base_url}&sort=recency&page={page}"
+            url = f"{url_prefix}{page}"
 
-            for attempt in range(1, max_retries + 1):
-                try:
-                    print(f"\n🌍 Page {page}: {url} (Attempt {attempt})")
-                    driver.get(url)
-                    time.sleep(2)
-                    break
-                except WebDriverException as e:
-                    print(f"⚠️ Failed to load page {page} (attempt {attempt}): {e}")
-                    if attempt == max_retries:
-                        print("❌ Max retries reached, skipping this page.")
-                        url = None
-                    else:
-                        time.sleep(5)
-            if not url:
+            print(f"\n🌍 Page {page}: {url}")
+            try:
+                blocks = page_blocks(page)
+            except PageFetchError as e:
+                print(f"❌ {e}, skipping page {page}.")
+                page += 1
+                continue
+            if blocks is None and http_client is not None:
+                print("⚠️ Review data not available over HTTP; switching to the browser.")
+                fetch_pool.shutdown(cancel_futures=True)
+                prefetched.clear()
+                http_client.close()
+                http_client = None
+                fetch_page, window = fetch_in_browser, browser_workers
+                fetch_pool = ThreadPoolExecutor(max_workers=window)
+                next_fetch = page
+                blocks = page_blocks(page)
+            if blocks is None:
                 page += 1
                 continue
 
-            blocks = driver.find_elements(By.CSS_SELECTOR, "article")
             if not blocks:
                 print("⚠️ No review cards found. Continuing to next page.")
                 page += 1
-                time.sleep(1.2)
+                limiter.backoff()
                 # If we keep seeing no blocks, count as no-additions
                 consecutive_no_additions += 1
                 if (mode != 1 or not max_pages) and consecutive_no_additions >= max_consecutive_no_additions:
@@ -274,73 +820,76 @@ def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, r
                     break
                 continue
 
+            limiter.success()
             page_found = 0
             page_added = 0
             page_links_for_signature = []
             page_all_older_than_cutoff = True if cutoff_date else False
 
-            for i, block in enumerate(blocks):
+            for block in blocks:
                 page_found += 1
-                maybe_click_see_more(driver, block)
-                if i == 0:
-                    time.sleep(0.5)
 
-                reviewer = extract_reviewer_name(block)
-                text = extract_review_text(block)
+                reviewer = block["reviewer"]
+                text = block["text"]
                 # Skip teaser/empty reviews to avoid blank cards
                 if not text or text.endswith("See more"):
                     continue
-                review_link = extract_review_permalink(block)
+                review_link = canonical_link(block["link"])
                 if review_link:
-                    page_links_for_signature.append(canonical_link(review_link))
+                    page_links_for_signature.append(review_link)
 
                 try:
-                    date_el = block.find_element(By.TAG_NAME, "time")
-                    date_str = date_el.get_attribute("datetime").split("T")[0]
-                    review_date = datetime.strptime(date_str, "%Y-%m-%d")
+                    date_str = block["datetime"].split("T")[0]
+                    date.fromisoformat(date_str)
                 except Exception:
                     # If date unavailable, do not add; also this makes signature less likely to be identical
                     continue
 
-                if cutoff_date and review_date >= cutoff_date:
+                # A review dated on the cutoff day is still older than the cutoff moment
+                if cutoff_s and date_str > cutoff_s:
                     page_all_older_than_cutoff = False
+                # Already collected (page overlap / resume): skip the remaining filters.
+                # Done after the cutoff check so mode 2's end detection still sees it
+                if review_link and ("link", review_link) in seen_keys:
+                    continue
                 # Date interval filtering
-                if start_dt and review_date < start_dt:
+                if start_s and date_str < start_s:
                     continue
-                if end_dt and review_date > end_dt:
+                if end_s and date_str > end_s:
                     continue
 
                 # Keyword filter logic (AND + OR)
-                add_review = True
-                if keywords:
-                    if keyword_and and not all(k.lower() in text.lower() for k in keyword_and):
-                        add_review = False
-                    if keyword_or and not any(k.lower() in text.lower() for k in keyword_or):
-                        add_review = False if not keyword_and else add_review
-
-                if not add_review:
+                if keyword_filter and not keyword_filter(text.lower()):
                     continue
 
-                key = stable_review_key(reviewer, review_date.strftime("%Y-%m-%d"), review_link or "", text)
+                key = stable_review_key(reviewer, date_str, review_link, text)
                 if key in seen_keys:
                     continue
                 seen_keys.add(key)
 
-                reviews.append({
-                    "reviewer": reviewer,
-                    "date": review_date.strftime("%Y-%m-%d"),
-                    "link": canonical_link(review_link),
-                    "text": text
-                })
+                # Few distinct dates and many repeat reviewers: share one string each
+                reviewers.append(sys.intern(reviewer))
+                dates.append(sys.intern(date_str))
+                links.append(review_link)
+                texts.append(text)
                 page_added += 1
-                print(f"✅ Added review ({review_date.strftime('%Y-%m-%d')}): {text[:60]}...")
+                print(f"✅ Added review ({date_str}): {text[:60]}...")
 
-            print(f"📄 Page {page}: found {page_found} cards, added {page_added} reviews (total: {len(reviews)})")
+            print(f"📄 Page {page}: found {page_found} cards, added {page_added} reviews (total: {len(texts)})")
 
-            save_reviews(reviews, filename_base, mode, max_pages, months, keywords, start_date=start_date, end_date=end_date)
+            if len(texts) > last_saved_idx:
+                if pending_save is not None:
+                    pending_save.result()
+                # The slices are copies, so the main thread can keep appending
+                pending_save = save_pool.submit(append_reviews, writers, page, tuple(col[last_saved_idx:] for col in columns))
+                last_saved_idx = len(texts)
 
             # Build a stable signature of this page's content to detect last page loops
-            page_signature = tuple(page_links_for_signature[:20])  # top 20 links are enough
+            # XOR of the link hashes: order-independent, compared as a single int.
+            # Only compared within one run, so the per-process hash() seed doesn't matter
+            page_signature = 0
+            for link in page_links_for_signature[:20]:  # top 20 links are enough
+                page_signature ^= hash(link)
             if previous_page_signature is not None and page_signature == previous_page_signature:
                 same_page_signature_count += 1
             else:
@@ -374,7 +923,6 @@ def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, r
                     should_stop = True
 
             page += 1
-            time.sleep(1.2)
 
             if should_stop:
                 print("⏹ Stopping based on end-of-results detection.")
@@ -385,47 +933,128 @@ def scrape_reviews(base_url, mode, max_pages=None, months=None, keywords=None, r
         print("\n🛑 Interrupted by user.")
 
     finally:
-        driver.quit()
+        fetch_pool.shutdown(cancel_futures=True)
+        for worker in drivers:
+            worker.quit()
+        if http_client is not None:
+            http_client.close()
+        save_pool.shutdown(wait=True)
+        if pending_save is not None and pending_save.exception() is not None:
+            print(f"⚠️ Failed to save the last page: {pending_save.exception()}")
         if 'interrupted' in locals() and interrupted:
-            print(f"ℹ️ Collected {len(reviews)} reviews before interrupt.")
-        save_reviews(reviews, filename_base, mode, max_pages, months, keywords, start_date=start_date, end_date=end_date)
+            print(f"ℹ️ Collected {len(texts)} reviews before interrupt.")
+        finalize_outputs(writers, columns, filename_base, mode=mode, max_pages=max_pages, months=months,
+                         keywords=keywords, start_date=start_date, end_date=end_date)
 
-    return reviews
+    return review_dicts(columns)
 
 
 # ----------------------- Main -----------------------
 
-if __name__ == "__main__":
-    import argparse
-    parser = argparse.ArgumentParser(description="Trustpilot scraper")
-    parser.add_argument("--url", dest="url", default="https://www.trustpilot.com/review/www.europcar.co.uk?stars=1")
-    parser.add_argument("--pages", dest="pages", default="", help="Number of pages (or 'all')")
-    parser.add_argument("--months", dest="months", type=str, default="", help="Months back")
-    parser.add_argument("--keywords", dest="keywords", type=str, default="", help="Comma separated keywords")
-    parser.add_argument("--resume", dest="resume", action="store_true")
-    parser.add_argument("--resume_file", dest="resume_file", type=str, default="", help="Path to prior results.json")
-    parser.add_argument("--start_date", dest="start_date", type=str, default="", help="Start date YYYY-MM-DD")
-    parser.add_argument("--end_date", dest="end_date", type=str, default="", help="End date YYYY-MM-DD")
-    args = parser.parse_args()
-
+def run_from_args(args, driver=None):
     base_url = args.url
     resume = bool(args.resume)
+    common = dict(resume=resume, resume_file=args.resume_file or None, use_browser=args.use_browser, driver=driver,
+                  min_page_interval=args.min_interval)
 
     # Determine mode based on provided arguments
     if args.pages:
         pages_in = args.pages.strip().lower()
         max_pages = None if pages_in == "all" else int(pages_in)
-        scrape_reviews(base_url, mode=1, max_pages=max_pages, resume=resume, resume_file=args.resume_file or None)
+        return scrape_reviews(base_url, mode=1, max_pages=max_pages, **common)
     elif args.months:
         months_in = int(args.months)
-        scrape_reviews(base_url, mode=2, months=months_in, resume=resume, resume_file=args.resume_file or None)
+        return scrape_reviews(base_url, mode=2, months=months_in, **common)
     elif args.keywords:
         kws = [w.strip() for w in args.keywords.split(",") if w.strip()]
-        scrape_reviews(base_url, mode=3, keywords=kws, resume=resume, resume_file=args.resume_file or None)
+        return scrape_reviews(base_url, mode=3, keywords=kws, **common)
     elif args.start_date and args.end_date:
-        scrape_reviews(base_url, mode=4, start_date=args.start_date, end_date=args.end_date, resume=resume, resume_file=args.resume_file or None)
+        return scrape_reviews(base_url, mode=4, start_date=args.start_date, end_date=args.end_date, **common)
     else:
         # Default: pages=all
-        scrape_reviews(base_url, mode=1, max_pages=None, resume=resume, resume_file=args.resume_file or None)
+        return scrape_reviews(base_url, mode=1, max_pages=None, **common)
+
+
+def main_repl(parser, headless=True):
+    """Run a scrape per input line (same flags as the CLI), keeping Chrome warm between them.
+
+    Chrome is only started the first time a scrape needs the browser. Ctrl+C
+    stops the current scrape (its results are still saved) and returns to the
+    prompt; Ctrl+D exits.
+    """
+    warm = []
+
+    def get_driver():
+        # Rebuild the browser if chromedriver went away since the last scrape
+        if warm and not warm[0].service.is_connectable():
+            stale = warm.pop()
+            try:
+                stale.quit()
+            except Exception:
+                pass
+        if not warm:
+            warm.append(build_driver(headless))
+        return warm[0]
+
+    print("🔁 REPL mode: enter scrape flags, e.g. --pages 3 or --keywords refund,deposit")
+    try:
+        while True:
+            try:
+                line = input("scrape> ").strip()
+            except KeyboardInterrupt:
+                print()
+                continue
+            except EOFError:
+                print()
+                break
+            if not line:
+                continue
+            try:
+                run_args = parser.parse_args(shlex.split(line))
+            except SystemExit:
+                # argparse already printed the usage error
+                continue
+            except ValueError as e:
+                # e.g. an unbalanced quote
+                print(f"⚠️ {e}")
+                continue
+            try:
+                run_from_args(run_args, driver=get_driver)
+            except KeyboardInterrupt:
+                print("\n🛑 Interrupted by user.")
+            except Exception as e:
+                print(f"❌ Scrape failed: {e}")
+    finally:
+        for driver in warm:
+            try:
+                driver.quit()
+            except Exception:
+                pass
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Trustpilot scraper")
+    parser.add_argument("--url", dest="url", default="https://www.trustpilot.com/review/www.europcar.co.uk?stars=1")
+    parser.add_argument("--pages", dest="pages", default="", help="Number of pages (or 'all')")
+    parser.add_argument("--months", dest="months", type=str, default="", help="Months back")
+    parser.add_argument("--keywords", dest="keywords", type=str, default="", help="Comma separated keywords")
+    parser.add_argument("--resume", dest="resume", action="store_true")
+    parser.add_argument("--resume_file", dest="resume_file", type=str, default="", help="Path to prior results.json")
+    parser.add_argument("--start_date", dest="start_date", type=str, default="", help="Start date YYYY-MM-DD")
+    parser.add_argument("--end_date", dest="end_date", type=str, default="", help="End date YYYY-MM-DD")
+    parser.add_argument("--use-browser", dest="use_browser", action="store_true", help="Always scrape with Chrome instead of plain HTTP")
+    parser.add_argument("--min-interval", dest="min_interval", type=float, default=MIN_PAGE_INTERVAL, help="Minimum seconds between page requests")
+    parser.add_argument("--repl", dest="repl", action="store_true", help="Keep Chrome running and read scrape flags from stdin")
+    args = parser.parse_args()
+
+    if args.repl:
+        main_repl(parser)
+        sys.exit(0)
 
+    # The web UI stops a scrape with SIGTERM; handle it like Ctrl+C so the final save still runs
+    def _handle_sigterm(signum, frame):
+        raise KeyboardInterrupt
+    signal.signal(signal.SIGTERM, _handle_sigterm)
 
+    run_from_args(args)